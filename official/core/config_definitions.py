@@ -54,6 +54,7 @@ class DataConfig(base_config.Config):
     block_length: The number of consecutive elements to produce from each input
       element before cycling to another input element when interleaving files.
     deterministic: A boolean controlling whether determinism should be enforced.
+    map_fusion: Whether to enable tf.data map fusion.
     sharding: Whether sharding is used in the input pipeline.
     enable_tf_data_service: A boolean indicating whether to enable tf.data
       service for the input pipeline.
@@ -86,6 +87,7 @@ class DataConfig(base_config.Config):
   cycle_length: Optional[int] = None
   block_length: int = 1
   deterministic: Optional[bool] = None
+  map_fusion: bool = False
   sharding: bool = True
   enable_tf_data_service: bool = False
   tf_data_service_address: Optional[str] = None
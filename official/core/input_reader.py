@@ -116,6 +116,7 @@ class InputReader:
     self._cycle_length = params.cycle_length
     self._block_length = params.block_length
     self._deterministic = params.deterministic
+    self._map_fusion = params.map_fusion
     self._sharding = params.sharding
     self._tfds_split = params.tfds_split
     self._tfds_as_supervised = params.tfds_as_supervised
@@ -403,6 +404,15 @@ class InputReader:
                 job_name=self._tf_data_service_job_name))
     return dataset
 
+  def _apply_options(self, dataset: tf.data.Dataset) -> tf.data.Dataset:
+    """Applies the tf.data options configured in the params."""
+    options = tf.data.Options()
+    if self._deterministic is not None:
+      options.experimental_deterministic = self._deterministic
+    if self._map_fusion:
+      options.experimental_optimization.map_fusion = True
+    return dataset.with_options(options)
+
   def read(
       self,
       input_context: Optional[tf.distribute.InputContext] = None
@@ -416,8 +426,5 @@ class InputReader:
     dataset = _maybe_map_fn(dataset, self._postprocess_fn)
     dataset = self._maybe_apply_data_service(dataset, input_context)
 
-    if self._deterministic is not None:
-      options = tf.data.Options()
-      options.experimental_deterministic = self._deterministic
-      dataset = dataset.with_options(options)
+    dataset = self._apply_options(dataset)
     return dataset.prefetch(tf.data.experimental.AUTOTUNE)
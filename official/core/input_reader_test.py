@@ -0,0 +1,81 @@
+# Copyright 2021 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for official.core.input_reader."""
+
+import dataclasses
+import os
+
+from absl.testing import parameterized
+import tensorflow as tf
+
+from official.core import config_definitions as cfg
+from official.core import input_reader
+from official.vision.beta.configs import common
+from official.vision.beta.dataloaders import input_reader as vision_input_reader
+
+
+@dataclasses.dataclass
+class _CombinationDataConfig(cfg.DataConfig):
+  pseudo_label_data: common.PseudoLabelDataConfig = (
+      common.PseudoLabelDataConfig())
+
+
+def _write_tfrecord(path):
+  with tf.io.TFRecordWriter(path) as writer:
+    for i in range(4):
+      writer.write(str(i).encode('utf8'))
+
+
+class InputReaderTest(tf.test.TestCase, parameterized.TestCase):
+
+  @parameterized.parameters(True, False)
+  def test_map_fusion(self, map_fusion):
+    path = os.path.join(self.get_temp_dir(), 'data.tfrecord')
+    _write_tfrecord(path)
+
+    params = cfg.DataConfig(
+        input_path=path,
+        global_batch_size=2,
+        is_training=False,
+        map_fusion=map_fusion)
+    dataset = input_reader.InputReader(params).read()
+
+    self.assertEqual(
+        bool(dataset.options().experimental_optimization.map_fusion),
+        map_fusion)
+
+  @parameterized.parameters(True, False)
+  def test_map_fusion_combination_dataset(self, map_fusion):
+    path = os.path.join(self.get_temp_dir(), 'labeled.tfrecord')
+    pseudo_label_path = os.path.join(self.get_temp_dir(), 'pseudo.tfrecord')
+    _write_tfrecord(path)
+    _write_tfrecord(pseudo_label_path)
+
+    params = _CombinationDataConfig(
+        input_path=path,
+        global_batch_size=2,
+        is_training=False,
+        map_fusion=map_fusion,
+        pseudo_label_data=common.PseudoLabelDataConfig(
+            input_path=pseudo_label_path, data_ratio=1.0))
+    dataset = vision_input_reader.CombinationDatasetInputReader(params).read()
+
+    self.assertEqual(
+        bool(dataset.options().experimental_optimization.map_fusion),
+        map_fusion)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -28,6 +28,8 @@ Example usage:
 """
 
 import collections
+from concurrent import futures
+import io
 import json
 import logging
 import os
@@ -85,7 +87,12 @@ def coco_segmentation_to_mask_png(segmentation, height, width, is_crowd):
   run_len_encoding = mask.frPyObjects(segmentation, height, width)
   binary_mask = mask.decode(run_len_encoding)
   if not is_crowd:
-    binary_mask = np.amax(binary_mask, axis=2)
+    # Polygon segmentations decode to one channel per polygon. Most objects
+    # have a single polygon, in which case no reduction is needed.
+    if binary_mask.ndim == 3 and binary_mask.shape[2] == 1:
+      binary_mask = binary_mask[..., 0]
+    elif binary_mask.ndim == 3:
+      binary_mask = np.bitwise_or.reduce(binary_mask, axis=2)
 
   return tfrecord_lib.encode_mask_as_png(binary_mask)
 
@@ -99,7 +106,7 @@ def generate_coco_panoptics_masks(segments_info, mask_path,
     segments_info: a list of dicts, where each dict has keys: [u'id',
       u'category_id', u'area', u'bbox', u'iscrowd'], detailing information for
       each segment in the panoptic mask.
-    mask_path: path to the panoptic mask.
+    mask_path: path to the panoptic mask, or a file object containing it.
     include_panoptic_masks: bool, when set to True, category and instance
       masks are included in the outputs. Set this to True, when using
       the Panoptic Quality evaluator.
@@ -205,27 +212,32 @@ def bbox_annotations_to_feature_dict(
   data, num_skipped = coco_annotations_to_lists(
       bbox_annotations, id_to_name_map, image_height, image_width,
       include_masks)
+  # The feature types are fixed, so pass them explicitly instead of having
+  # convert_to_feature infer them. This also handles images where every
+  # annotation was skipped and the lists are empty.
   feature_dict = {
       'image/object/bbox/xmin':
-          tfrecord_lib.convert_to_feature(data['xmin']),
+          tfrecord_lib.convert_to_feature(data['xmin'], 'float_list'),
       'image/object/bbox/xmax':
-          tfrecord_lib.convert_to_feature(data['xmax']),
+          tfrecord_lib.convert_to_feature(data['xmax'], 'float_list'),
       'image/object/bbox/ymin':
-          tfrecord_lib.convert_to_feature(data['ymin']),
+          tfrecord_lib.convert_to_feature(data['ymin'], 'float_list'),
       'image/object/bbox/ymax':
-          tfrecord_lib.convert_to_feature(data['ymax']),
+          tfrecord_lib.convert_to_feature(data['ymax'], 'float_list'),
       'image/object/class/text':
-          tfrecord_lib.convert_to_feature(data['category_names']),
+          tfrecord_lib.convert_to_feature(data['category_names'],
+                                          'bytes_list'),
       'image/object/class/label':
-          tfrecord_lib.convert_to_feature(data['category_id']),
+          tfrecord_lib.convert_to_feature(data['category_id'], 'int64_list'),
       'image/object/is_crowd':
-          tfrecord_lib.convert_to_feature(data['is_crowd']),
+          tfrecord_lib.convert_to_feature(data['is_crowd'], 'int64_list'),
       'image/object/area':
-          tfrecord_lib.convert_to_feature(data['area']),
+          tfrecord_lib.convert_to_feature(data['area'], 'float_list'),
   }
   if include_masks:
     feature_dict['image/object/mask'] = (
-        tfrecord_lib.convert_to_feature(data['encoded_mask_png']))
+        tfrecord_lib.convert_to_feature(data['encoded_mask_png'],
+                                        'bytes_list'))
 
   return feature_dict, num_skipped
 
@@ -238,6 +250,11 @@ def encode_caption_annotations(caption_annotations):
   return captions
 
 
+def _read_file(path):
+  with tf.io.gfile.GFile(path, 'rb') as fid:
+    return fid.read()
+
+
 def create_tf_example(image,
                       image_dirs,
                       panoptic_masks_dir=None,
@@ -305,8 +322,19 @@ def create_tf_example(image,
     image_dir, = image_dirs
     full_path = os.path.join(image_dir, filename)
 
-  with tf.io.gfile.GFile(full_path, 'rb') as fid:
-    encoded_jpg = fid.read()
+  if panoptic_annotation:
+    panoptic_mask_filename = os.path.join(
+        panoptic_masks_dir,
+        panoptic_annotation['file_name'])
+    # Read the panoptic mask in the background while the image is read, to
+    # overlap their I/O latency.
+    with futures.ThreadPoolExecutor(max_workers=1) as executor:
+      encoded_panoptic_png_future = executor.submit(
+          _read_file, panoptic_mask_filename)
+      encoded_jpg = _read_file(full_path)
+      encoded_panoptic_png = encoded_panoptic_png_future.result()
+  else:
+    encoded_jpg = _read_file(full_path)
 
   feature_dict = tfrecord_lib.image_info_to_feature_dict(
       image_height, image_width, filename, image_id, encoded_jpg, 'jpg')
@@ -321,27 +349,25 @@ def create_tf_example(image,
 
   if caption_annotations:
     encoded_captions = encode_caption_annotations(caption_annotations)
-    feature_dict.update(
-        {'image/caption': tfrecord_lib.convert_to_feature(encoded_captions)})
+    feature_dict.update({
+        'image/caption': tfrecord_lib.convert_to_feature(
+            encoded_captions, 'bytes_list')})
 
   if panoptic_annotation:
     segments_info = panoptic_annotation['segments_info']
-    panoptic_mask_filename = os.path.join(
-        panoptic_masks_dir,
-        panoptic_annotation['file_name'])
     encoded_panoptic_masks = generate_coco_panoptics_masks(
-        segments_info, panoptic_mask_filename, include_panoptic_masks,
-        is_category_thing)
+        segments_info, io.BytesIO(encoded_panoptic_png),
+        include_panoptic_masks, is_category_thing)
     feature_dict.update(
         {'image/segmentation/class/encoded': tfrecord_lib.convert_to_feature(
-            encoded_panoptic_masks['semantic_segmentation_mask'])})
+            encoded_panoptic_masks['semantic_segmentation_mask'], 'bytes')})
 
     if include_panoptic_masks:
       feature_dict.update({
           'image/panoptic/category_mask': tfrecord_lib.convert_to_feature(
-              encoded_panoptic_masks['category_mask']),
+              encoded_panoptic_masks['category_mask'], 'bytes'),
           'image/panoptic/instance_mask': tfrecord_lib.convert_to_feature(
-              encoded_panoptic_masks['instance_mask'])
+              encoded_panoptic_masks['instance_mask'], 'bytes')
             })
 
   example = tf.train.Example(features=tf.train.Features(feature=feature_dict))
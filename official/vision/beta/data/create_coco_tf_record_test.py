@@ -0,0 +1,105 @@
+# Copyright 2021 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for create_coco_tf_record."""
+
+import os
+
+from absl.testing import parameterized
+import numpy as np
+from PIL import Image
+from pycocotools import mask
+import tensorflow as tf
+
+from official.vision.beta.data import create_coco_tf_record
+
+
+class CreateCocoTfRecordTest(tf.test.TestCase, parameterized.TestCase):
+
+  @parameterized.named_parameters(
+      ('one_polygon', [[2., 2., 12., 3., 10., 14., 3., 11.]]),
+      ('two_polygons', [[2., 2., 8., 2., 8., 8., 2., 8.],
+                        [10., 9., 15., 9., 15., 15., 10., 15.]]),
+  )
+  def test_coco_segmentation_to_mask_png(self, segmentation):
+    height, width = 16, 18
+    encoded_mask_png = create_coco_tf_record.coco_segmentation_to_mask_png(
+        segmentation, height, width, is_crowd=False)
+
+    expected_mask = np.amax(
+        mask.decode(mask.frPyObjects(segmentation, height, width)), axis=2)
+    self.assertAllEqual(
+        tf.io.decode_png(encoded_mask_png)[..., 0], expected_mask)
+
+  def test_bbox_annotations_to_feature_dict_all_skipped(self):
+    bbox_annotations = [
+        {'bbox': [0, 0, 0, 10], 'iscrowd': 0, 'category_id': 1, 'area': 0.0},
+        {'bbox': [30, 30, 10, 10], 'iscrowd': 0, 'category_id': 1,
+         'area': 100.0},
+    ]
+
+    feature_dict, num_skipped = (
+        create_coco_tf_record.bbox_annotations_to_feature_dict(
+            bbox_annotations, image_height=32, image_width=32,
+            id_to_name_map={1: 'person'}, include_masks=False))
+
+    self.assertEqual(num_skipped, 2)
+    self.assertEmpty(feature_dict['image/object/bbox/xmin'].float_list.value)
+    self.assertEmpty(feature_dict['image/object/class/text'].bytes_list.value)
+    self.assertEmpty(feature_dict['image/object/class/label'].int64_list.value)
+    self.assertEmpty(feature_dict['image/object/area'].float_list.value)
+
+  def test_create_tf_example_with_panoptic_mask(self):
+    image_dir = self.get_temp_dir()
+    image = np.zeros((4, 6, 3), dtype=np.uint8)
+    Image.fromarray(image).save(os.path.join(image_dir, 'image.jpg'))
+    with tf.io.gfile.GFile(os.path.join(image_dir, 'image.jpg'), 'rb') as fid:
+      encoded_jpg = fid.read()
+
+    # The segment ids are encoded in the red channel: segment 1 covers the
+    # left half of the mask and segment 2 the right half.
+    panoptic_mask = np.zeros((4, 6, 3), dtype=np.uint8)
+    panoptic_mask[:, :3, 0] = 1
+    panoptic_mask[:, 3:, 0] = 2
+    Image.fromarray(panoptic_mask).save(os.path.join(image_dir, 'mask.png'))
+
+    panoptic_annotation = {
+        'image_id': 1,
+        'file_name': 'mask.png',
+        'segments_info': [
+            {'id': 1, 'category_id': 1},
+            {'id': 2, 'category_id': 92},
+        ],
+    }
+    example, num_skipped = create_coco_tf_record.create_tf_example(
+        image={'height': 4, 'width': 6, 'file_name': 'image.jpg', 'id': 1},
+        image_dirs=[image_dir],
+        panoptic_masks_dir=image_dir,
+        panoptic_annotation=panoptic_annotation,
+        is_category_thing={1: True, 92: False})
+
+    feature = example.features.feature
+    self.assertEqual(num_skipped, 0)
+    self.assertEqual(feature['image/encoded'].bytes_list.value[0],
+                     encoded_jpg)
+    semantic_mask = tf.io.decode_png(
+        feature['image/segmentation/class/encoded'].bytes_list.value[0])
+    expected_semantic_mask = np.zeros((4, 6, 1), dtype=np.uint8)
+    expected_semantic_mask[:, :3] = 1
+    expected_semantic_mask[:, 3:] = 2
+    self.assertAllEqual(semantic_mask, expected_semantic_mask)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -14,9 +14,9 @@
 
 """Helper functions for creating TFRecord datasets."""
 
+import functools
 import hashlib
 import io
-import itertools
 
 from absl import logging
 import numpy as np
@@ -90,13 +90,15 @@ def image_info_to_feature_dict(height, width, filename, image_id,
   key = hashlib.sha256(encoded_str).hexdigest()
 
   return {
-      'image/height': convert_to_feature(height),
-      'image/width': convert_to_feature(width),
-      'image/filename': convert_to_feature(filename.encode('utf8')),
-      'image/source_id': convert_to_feature(str(image_id).encode('utf8')),
-      'image/key/sha256': convert_to_feature(key.encode('utf8')),
-      'image/encoded': convert_to_feature(encoded_str),
-      'image/format': convert_to_feature(encoded_format.encode('utf8')),
+      'image/height': convert_to_feature(height, 'int64'),
+      'image/width': convert_to_feature(width, 'int64'),
+      'image/filename': convert_to_feature(filename.encode('utf8'), 'bytes'),
+      'image/source_id': convert_to_feature(
+          str(image_id).encode('utf8'), 'bytes'),
+      'image/key/sha256': convert_to_feature(key.encode('utf8'), 'bytes'),
+      'image/encoded': convert_to_feature(encoded_str, 'bytes'),
+      'image/format': convert_to_feature(
+          encoded_format.encode('utf8'), 'bytes'),
   }
 
 
@@ -112,9 +114,19 @@ def encode_mask_as_png(mask):
   return output_io.getvalue()
 
 
+def _process_and_serialize(process_func, unpack_arguments, args):
+  """Calls process_func and serializes the resulting tf.train.Example."""
+  if unpack_arguments:
+    tf_example, num_annotations_skipped = process_func(*args)
+  else:
+    tf_example, num_annotations_skipped = process_func(args)
+  return tf_example.SerializeToString(), num_annotations_skipped
+
+
 def write_tf_record_dataset(output_path, annotation_iterator,
                             process_func, num_shards,
-                            use_multiprocessing=True, unpack_arguments=True):
+                            use_multiprocessing=True, unpack_arguments=True,
+                            chunksize=16):
   """Iterates over annotations, processes them and writes into TFRecords.
 
   Args:
@@ -130,6 +142,8 @@ def write_tf_record_dataset(output_path, annotation_iterator,
     unpack_arguments:
       Whether to unpack the tuples from annotation_iterator as individual
         arguments to the process func or to pass the returned value as it is.
+    chunksize: int, the number of annotations sent to a worker process at a
+      time. Larger values amortize the inter-process communication overhead.
 
   Returns:
     num_skipped: The total number of skipped annotations.
@@ -143,25 +157,28 @@ def write_tf_record_dataset(output_path, annotation_iterator,
 
   total_num_annotations_skipped = 0
 
+  # Serialize the examples where they are created, so that with
+  # multiprocessing the worker processes do the serialization and only the
+  # bytes are sent back to be written.
+  process_func = functools.partial(
+      _process_and_serialize, process_func, unpack_arguments)
+
   if use_multiprocessing:
     pool = mp.Pool()
-    if unpack_arguments:
-      tf_example_iterator = pool.starmap(process_func, annotation_iterator)
-    else:
-      tf_example_iterator = pool.imap(process_func, annotation_iterator)
+    # imap streams the results back in order, unlike starmap which waits for
+    # the whole dataset to be processed before writing anything.
+    serialized_example_iterator = pool.imap(
+        process_func, annotation_iterator, chunksize=chunksize)
   else:
-    if unpack_arguments:
-      tf_example_iterator = itertools.starmap(process_func, annotation_iterator)
-    else:
-      tf_example_iterator = map(process_func, annotation_iterator)
+    serialized_example_iterator = map(process_func, annotation_iterator)
 
-  for idx, (tf_example, num_annotations_skipped) in enumerate(
-      tf_example_iterator):
+  for idx, (serialized_example, num_annotations_skipped) in enumerate(
+      serialized_example_iterator):
     if idx % 100 == 0:
       logging.info('On image %d', idx)
 
     total_num_annotations_skipped += num_annotations_skipped
-    writers[idx % num_shards].write(tf_example.SerializeToString())
+    writers[idx % num_shards].write(serialized_example)
 
   if use_multiprocessing:
     pool.close()
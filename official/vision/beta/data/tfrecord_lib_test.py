@@ -41,13 +41,15 @@ def parse_function(example_proto):
 
 class TfrecordLibTest(parameterized.TestCase):
 
-  def test_write_tf_record_dataset(self):
+  @parameterized.parameters(False, True)
+  def test_write_tf_record_dataset(self, use_multiprocessing):
     data = [(tfrecord_lib.convert_to_feature(i),) for i in range(17)]
 
-    path = os.path.join(FLAGS.test_tmpdir, 'train')
+    path = os.path.join(FLAGS.test_tmpdir, 'train_%s' % use_multiprocessing)
 
     tfrecord_lib.write_tf_record_dataset(
-        path, data, process_sample, 3, use_multiprocessing=False)
+        path, data, process_sample, 3, use_multiprocessing=use_multiprocessing,
+        chunksize=4)
     tfrecord_files = tf.io.gfile.glob(path + '*')
 
     self.assertLen(tfrecord_files, 3)
@@ -165,9 +165,6 @@ class CombinationDatasetInputReader(input_reader.InputReader):
     dataset_concat = self._maybe_apply_data_service(dataset_concat,
                                                     input_context)
 
-    if self._deterministic is not None:
-      options = tf.data.Options()
-      options.experimental_deterministic = self._deterministic
-      dataset_concat = dataset_concat.with_options(options)
+    dataset_concat = self._apply_options(dataset_concat)
 
     return dataset_concat.prefetch(tf.data.experimental.AUTOTUNE)